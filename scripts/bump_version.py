@@ -11,6 +11,9 @@ import re
 import sys
 from pathlib import Path
 
+# matches version = "x.y.z"
+VERSION_RE = re.compile(rb'^version\s*=\s*"([^"]+)"', re.MULTILINE)
+
 
 def bump_version(current_version: str, bump_type: str) -> str:
     """Increment the version string."""
@@ -39,6 +42,31 @@ def bump_version(current_version: str, bump_type: str) -> str:
     return f"{major}.{minor}.{patch}"
 
 
+def update_version_file(path: Path, bump_type: str) -> tuple[str, str]:
+    """Bump the version in *path* in place and return ``(old, new)``.
+
+    Only the bytes from the version string onward are rewritten; when the new
+    version has the same length as the old one, just the version itself is.
+    """
+    with open(path, "r+b") as f:
+        content = f.read()
+        match = VERSION_RE.search(content)
+        if not match:
+            raise ValueError(f"Could not find version string in {path.name}")
+
+        current_version = match.group(1).decode()
+        new_version = bump_version(current_version, bump_type)
+
+        f.seek(match.start(1))
+        if len(new_version) == len(current_version):
+            f.write(new_version.encode())
+        else:
+            f.write(new_version.encode() + content[match.end(1) :])
+            f.truncate()
+
+    return current_version, new_version
+
+
 def main():
     parser = argparse.ArgumentParser(description="Bump version in pyproject.toml")
     parser.add_argument(
@@ -57,29 +85,14 @@ def main():
         print(f"Error: Could not find {pyproject_path}", file=sys.stderr)
         sys.exit(1)
 
-    content = pyproject_path.read_text(encoding="utf-8")
-
-    # regex to find version = "x.y.z"
-    version_pattern = re.compile(r'^version\s*=\s*"([^"]+)"', re.MULTILINE)
-    match = version_pattern.search(content)
-
-    if not match:
-        print("Error: Could not find version string in pyproject.toml", file=sys.stderr)
-        sys.exit(1)
-
-    current_version = match.group(1)
-
     try:
-        new_version = bump_version(current_version, args.type)
+        current_version, new_version = update_version_file(pyproject_path, args.type)
     except ValueError as e:
         print(f"Error bumping version: {e}", file=sys.stderr)
         sys.exit(1)
 
     print(f"Bumping version from {current_version} to {new_version}")
 
-    new_content = content[: match.start(1)] + new_version + content[match.end(1) :]
-    pyproject_path.write_text(new_content, encoding="utf-8")
-
 
 if __name__ == "__main__":
     main()
@@ -10,14 +10,31 @@ https://github.com/usnistgov/oscal-content
 from __future__ import annotations
 
 import argparse
-import json
+import codecs
+import hashlib
+import io
 import logging
+import multiprocessing
+import os
+import pickle
 import re
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, suppress
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import IO, Any
 
+import ijson
+import orjson
 import requests
+import requests_cache
+from platformdirs import user_cache_dir
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from . import __version__
 from .urls import (
@@ -30,6 +47,11 @@ from .urls import (
 
 logger = logging.getLogger(__name__)
 
+CACHE_DIR = Path(user_cache_dir("ncsb"))
+
+# Fewer controls than this are parsed serially even when --workers is set.
+PARALLEL_MIN_CONTROLS = 512
+
 CONTROL_ID_RE = re.compile(r"^[A-Z]{2,3}-\d{1,3}$")
 ENHANCEMENT_RE = re.compile(r"^([A-Z]{2,3}-\d{1,3})\((\d+)\)$")
 
@@ -39,35 +61,179 @@ ENHANCEMENT_RE = re.compile(r"^([A-Z]{2,3}-\d{1,3})\((\d+)\)$")
 # ---------------------------------------------------------------------------
 
 
-def download_json(url: str) -> dict[str, Any]:
-    r = requests.get(url, timeout=120)
-    r.raise_for_status()
-    return r.json()
+def make_session(*, cache: bool = True) -> requests.Session:
+    """Return the HTTP session used for all downloads.
+
+    By default responses are kept in an on-disk SQLite cache under
+    :data:`CACHE_DIR`.  Stale entries are revalidated with
+    ``If-None-Match``/``If-Modified-Since``, so unchanged upstream files come
+    back as an empty ``304`` instead of a full download.
+
+    Either way, HTTPS connections are pooled (enough for every concurrent
+    fetch to keep its own) and transient gateway errors are retried.
+    """
+    if cache:
+        session = requests_cache.CachedSession(
+            cache_name=CACHE_DIR / "http",
+            backend="sqlite",
+            cache_control=True,
+            expire_after=86400,
+        )
+    else:
+        session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries))
+    return session
+
+
+@contextmanager
+def download(url: str, session: requests.Session) -> Iterator[requests.Response]:
+    """Yield the successful response for *url* with its body not yet read."""
+    with session.get(url, stream=True, timeout=120) as r:
+        r.raise_for_status()
+        yield r
+
+
+def _strip_bom(body: bytes) -> bytes:
+    # r.json() tolerated a UTF-8 BOM; orjson and ijson reject it.
+    return body[len(codecs.BOM_UTF8) :] if body.startswith(codecs.BOM_UTF8) else body
+
+
+def _body_stream(r: requests.Response) -> IO[bytes]:
+    """Return a binary file object over the (decompressed) body of *r*, past any UTF-8 BOM."""
+    if getattr(r, "from_cache", False):
+        # A cached body is already in memory, and requests-cache's raw
+        # reader closes itself on the zero-length probe read ijson issues.
+        return io.BytesIO(_strip_bom(r.content))
+    r.raw.decode_content = True
+    r.raw.auto_close = False  # otherwise urllib3 reports closed to BufferedReader once drained
+    fp = io.BufferedReader(r.raw)
+    if fp.peek(len(codecs.BOM_UTF8)).startswith(codecs.BOM_UTF8):
+        fp.read(len(codecs.BOM_UTF8))
+    return fp
+
+
+def _parsed_cache_path(url: str, parse: Callable[..., Any]) -> Path:
+    """Return where the parsed form of the document at *url* is cached.
+
+    There is one file per parser and URL; :func:`_read_parsed` checks the
+    stamp stored inside it, so a new ETag or release replaces the entry.
+    """
+    key = hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+    return CACHE_DIR / "parsed" / f"{parse.__name__}-{key}.pkl"
+
+
+def _read_parsed(path: Path, stamp: tuple[str, str]) -> Any | None:
+    """Return the value cached at *path* if it was stored under *stamp*, else ``None``."""
+    try:
+        with open(path, "rb") as f:
+            entry = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # The cache is advisory: a truncated or foreign file can fail in many ways, all meaning "re-parse".
+        logger.warning("Ignoring unreadable parse cache %s", path)
+        return None
+    if isinstance(entry, tuple) and len(entry) == 2 and entry[0] == stamp:
+        return entry[1]
+    return None
+
+
+def _write_parsed(path: Path, stamp: tuple[str, str], value: Any) -> None:
+    """Pickle *value* with its *stamp* to *path* atomically, so readers never see a partial file.
+
+    Failures are logged and otherwise ignored: the run has its parsed result already.
+    """
+    tmp_name = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as f:
+            tmp_name = f.name
+            pickle.dump((stamp, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, path)
+    except OSError:
+        logger.warning("Could not write parse cache %s", path)
+        if tmp_name is not None:
+            with suppress(OSError):
+                os.unlink(tmp_name)
+
+
+def _load_oscal(
+    url: str,
+    session: requests.Session,
+    parse: Callable[..., Any],
+    stream_parse: Callable[..., Any],
+    *,
+    stream: bool,
+    cache: bool,
+    **parse_kwargs: Any,
+) -> Any:
+    """Download the OSCAL document at *url* and parse it.
+
+    With *cache*, the parsed result is memoized on disk under the response's
+    ETag, so a document that has not changed upstream is never parsed twice.
+    *parse_kwargs* are passed to the parser and must not affect its result.
+    """
+    with download(url, session) as r:
+        etag = r.headers.get("ETag") if cache else None
+        cache_path = _parsed_cache_path(url, parse) if etag else None
+        stamp = (__version__, etag)
+        if cache_path is not None and (cached := _read_parsed(cache_path, stamp)) is not None:
+            return cached
+        if stream:
+            result = stream_parse(_body_stream(r), **parse_kwargs)
+        else:
+            result = parse(orjson.loads(_strip_bom(r.content)), **parse_kwargs)
+    if cache_path is not None:
+        _write_parsed(cache_path, stamp, result)
+    return result
+
+
+def _fetch_all(
+    jobs: dict[str, tuple[Callable[..., Any], str]],
+    session: requests.Session,
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """Run ``load(url, session, **kwargs)`` for every job concurrently.
+
+    *jobs* maps a result name to a ``(load, url)`` pair.  The downloads are
+    I/O-bound, so a thread per URL brings the network phase down from the sum
+    of the round-trips to the slowest one.  Sharing *session* lets fetches to
+    the same host reuse pooled connections.
+    """
+    with ThreadPoolExecutor(max_workers=max(len(jobs), 1)) as pool:
+        futures = {name: pool.submit(load, url, session, **kwargs) for name, (load, url) in jobs.items()}
+        return {name: fut.result() for name, fut in futures.items()}
 
 
 # ---------------------------------------------------------------------------
 # OSCAL ID helpers
 # ---------------------------------------------------------------------------
+#
+# The same IDs recur across the catalog's related-control links and every
+# profile's with-ids list, so the helpers below are memoized.
 
 
+@lru_cache(maxsize=8192)
 def oscal_id_to_control_id(oscal_id: str) -> str:
     """Convert an OSCAL-style ID to the canonical display form.
 
     ``"ac-2"``   -> ``"AC-2"``
     ``"ac-2.1"`` -> ``"AC-2(1)"``
     """
-    parts = oscal_id.split(".")
-    base = parts[0].upper()
-    if len(parts) == 2:
-        return f"{base}({int(parts[1])})"
-    return base
+    dot = oscal_id.find(".")
+    if dot < 0:
+        return oscal_id.upper()
+    return f"{oscal_id[:dot].upper()}({int(oscal_id[dot + 1 :])})"
 
 
+@lru_cache(maxsize=4096)
 def parent_of(control_id: str) -> str | None:
     m = ENHANCEMENT_RE.match(control_id)
     return m.group(1) if m else None
 
 
+@lru_cache(maxsize=4096)
 def family_of(control_id: str) -> str:
     base = parent_of(control_id) or control_id
     return base.split("-")[0]
@@ -78,58 +244,112 @@ def family_of(control_id: str) -> str:
 # ---------------------------------------------------------------------------
 
 
-def _collect_prose(parts: list[dict[str, Any]], target_name: str) -> str | None:
-    """Recursively collect ``prose`` from *parts* whose ``name`` equals *target_name*."""
-    fragments: list[str] = []
-    for part in parts:
-        if part.get("name") == target_name:
+def _collect_prose(parts: list[dict[str, Any]], targets: Iterable[str]) -> dict[str, list[str]]:
+    """Collect ``prose`` fragments for every part name in *targets* in one pass.
+
+    A part whose ``name`` is a target contributes its own prose plus that of
+    its direct sub-parts; any other part is searched recursively.  The walk
+    uses an explicit stack and preserves document order.
+    """
+    out: dict[str, list[str]] = {name: [] for name in targets}
+    # Each entry carries the targets already matched by an ancestor, which
+    # are not searched for again below it.
+    stack: list[tuple[dict[str, Any], frozenset[str]]] = [(part, frozenset()) for part in reversed(parts)]
+    while stack:
+        part, matched = stack.pop()
+        name = part.get("name")
+        subs = part.get("parts", [])
+        if name in out and name not in matched:
+            fragments = out[name]
             if prose := part.get("prose"):
                 fragments.append(prose)
-            for sub in part.get("parts", []):
-                if sub_prose := sub.get("prose"):
-                    fragments.append(sub_prose)
-        elif part.get("parts"):
-            nested = _collect_prose(part["parts"], target_name)
-            if nested:
-                fragments.append(nested)
-    return "\n".join(fragments) if fragments else None
+            fragments.extend(sub_prose for sub in subs if (sub_prose := sub.get("prose")))
+            matched = matched | {name}
+            if len(matched) == len(out):
+                continue
+        stack.extend((sub, matched) for sub in reversed(subs))
+    return out
 
 
 def _related_controls(links: list[dict[str, Any]]) -> str | None:
-    ids: list[str] = []
-    for link in links:
-        if link.get("rel") == "related":
-            href = link.get("href", "")
-            if href.startswith("#"):
-                ids.append(oscal_id_to_control_id(href[1:]))
+    to_control_id = oscal_id_to_control_id
+    ids = [
+        to_control_id(href[1:])
+        for link in links
+        if link.get("rel") == "related" and (href := link.get("href", "")).startswith("#")
+    ]
     return ", ".join(ids) if ids else None
 
 
 def _parse_control(ctrl: dict[str, Any], parent_id: str | None) -> dict[str, Any]:
     cid = oscal_id_to_control_id(ctrl["id"])
-    parts = ctrl.get("parts", [])
+    prose = _collect_prose(ctrl.get("parts", []), ("statement", "guidance"))
     return {
         "control_id": cid,
         "control_name": ctrl.get("title"),
         "family": family_of(cid),
-        "control_text": _collect_prose(parts, "statement"),
-        "discussion": _collect_prose(parts, "guidance"),
+        "control_text": "\n".join(prose["statement"]) or None,
+        "discussion": "\n".join(prose["guidance"]) or None,
         "related_controls": _related_controls(ctrl.get("links", [])),
         "parent_control_id": parent_id,
     }
 
 
-def parse_oscal_catalog(data: dict[str, Any]) -> dict[str, dict[str, Any]]:
+def _control_tasks(ctrls: Iterable[dict[str, Any]]) -> Iterator[tuple[dict[str, Any], str | None]]:
+    """Yield ``(control, parent_id)`` for each top-level control and its enhancements."""
+    for ctrl in ctrls:
+        yield ctrl, None
+        parent_id = oscal_id_to_control_id(ctrl["id"])
+        for enh in ctrl.get("controls", []):
+            yield enh, parent_id
+
+
+def _parse_control_task(task: tuple[dict[str, Any], str | None]) -> dict[str, Any]:
+    return _parse_control(*task)
+
+
+def _parse_controls(ctrls: Iterable[dict[str, Any]], workers: int = 1) -> dict[str, dict[str, Any]]:
+    """Parse top-level controls and their enhancements into ``{control_id: record}``.
+
+    With *workers* > 1 and at least :data:`PARALLEL_MIN_CONTROLS` controls,
+    parsing is spread over a process pool.  That needs every raw control in
+    memory at once, so the serial path (which consumes *ctrls* lazily) stays
+    the default; below the threshold, process start-up costs more than it saves.
+    """
+    tasks: Iterable[tuple[dict[str, Any], str | None]] = _control_tasks(ctrls)
+    if workers > 1:
+        tasks = list(tasks)
+        if len(tasks) >= PARALLEL_MIN_CONTROLS:
+            # spawn, because the catalog is parsed on a download thread and
+            # forking a multi-threaded process is unsafe.
+            with multiprocessing.get_context("spawn").Pool(workers) as pool:
+                return {rec["control_id"]: rec for rec in pool.imap(_parse_control_task, tasks, chunksize=64)}
+    parse = _parse_control
+    return {rec["control_id"]: rec for rec in (parse(ctrl, parent_id) for ctrl, parent_id in tasks)}
+
+
+def parse_oscal_catalog(data: dict[str, Any], *, workers: int = 1) -> dict[str, dict[str, Any]]:
     """Return ``{control_id: record}`` from an OSCAL catalog JSON."""
-    out: dict[str, dict[str, Any]] = {}
-    for group in data.get("catalog", {}).get("groups", []):
-        for ctrl in group.get("controls", []):
-            rec = _parse_control(ctrl, parent_id=None)
-            out[rec["control_id"]] = rec
-            for enh in ctrl.get("controls", []):
-                enh_rec = _parse_control(enh, parent_id=rec["control_id"])
-                out[enh_rec["control_id"]] = enh_rec
-    return out
+    groups = data.get("catalog", {}).get("groups", [])
+    return _parse_controls((ctrl for group in groups for ctrl in group.get("controls", [])), workers)
+
+
+def stream_oscal_catalog(fp: IO[bytes], *, workers: int = 1) -> dict[str, dict[str, Any]]:
+    """Like :func:`parse_oscal_catalog`, but reads the catalog incrementally.
+
+    Only one top-level control (with its enhancements) is materialized at a
+    time, instead of the whole catalog document.
+    """
+    return _parse_controls(ijson.items(fp, "catalog.groups.item.controls.item"), workers)
+
+
+def load_catalog(
+    url: str, session: requests.Session, *, stream: bool = True, cache: bool = True, workers: int = 1
+) -> dict[str, dict[str, Any]]:
+    """Download and parse the OSCAL catalog at *url*."""
+    return _load_oscal(
+        url, session, parse_oscal_catalog, stream_oscal_catalog, stream=stream, cache=cache, workers=workers
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -137,14 +357,28 @@ def parse_oscal_catalog(data: dict[str, Any]) -> dict[str, dict[str, Any]]:
 # ---------------------------------------------------------------------------
 
 
-def parse_oscal_profile(data: dict[str, Any]) -> set[str]:
-    """Return the set of canonical control IDs selected by an OSCAL profile."""
-    ids: set[str] = set()
+def _iter_with_ids(data: dict[str, Any]) -> Iterator[str]:
+    """Yield the raw OSCAL ``with-ids`` entries of a profile, in order."""
     for imp in data.get("profile", {}).get("imports", []):
         for ic in imp.get("include-controls", []):
-            for wid in ic.get("with-ids", []):
-                ids.add(oscal_id_to_control_id(wid))
-    return ids
+            yield from ic.get("with-ids", [])
+
+
+def parse_oscal_profile(data: dict[str, Any]) -> set[str]:
+    """Return the set of canonical control IDs selected by an OSCAL profile."""
+    to_control_id = oscal_id_to_control_id
+    return {to_control_id(wid) for wid in _iter_with_ids(data)}
+
+
+def stream_oscal_profile(fp: IO[bytes]) -> set[str]:
+    """Like :func:`parse_oscal_profile`, but reads the profile incrementally."""
+    to_control_id = oscal_id_to_control_id
+    return {to_control_id(wid) for wid in ijson.items(fp, "profile.imports.item.include-controls.item.with-ids.item")}
+
+
+def load_profile(url: str, session: requests.Session, *, stream: bool = True, cache: bool = True) -> set[str]:
+    """Download and parse the OSCAL profile at *url*."""
+    return _load_oscal(url, session, parse_oscal_profile, stream_oscal_profile, stream=stream, cache=cache)
 
 
 # ---------------------------------------------------------------------------
@@ -171,29 +405,112 @@ def membership_flags(cid: str, low: set[str], moderate: set[str], high: set[str]
     }
 
 
-def severity_from_membership(m: dict[str, bool], rules: Rules) -> str:
-    if m["low"]:
+def severity_from_flags(low: bool, moderate: bool, high: bool, privacy: bool, rules: Rules) -> str:
+    if low:
         return rules.severity_low
-    if m["moderate"]:
+    if moderate:
         return rules.severity_moderate
-    if m["high"]:
+    if high:
         return rules.severity_high
-    if m["privacy"] and not (m["low"] or m["moderate"] or m["high"]):
+    if privacy:
         return rules.severity_privacy_only
     return rules.severity_none
 
 
+def severity_from_membership(m: dict[str, bool], rules: Rules) -> str:
+    return severity_from_flags(m["low"], m["moderate"], m["high"], m["privacy"], rules)
+
+
 def non_negotiable_from_membership(m: dict[str, bool], rules: Rules) -> bool:
     if rules.non_negotiable_min_baseline.lower() == "high":
         return bool(m["high"])
     return bool(m["moderate"] or m["high"])
 
 
+def _enrich_one(
+    rec: dict[str, Any],
+    *,
+    low: frozenset[str],
+    moderate: frozenset[str],
+    high: frozenset[str],
+    privacy: frozenset[str],
+    non_negotiable: frozenset[str],
+    rules: Rules,
+) -> dict[str, Any]:
+    """Return a copy of *rec* with baseline membership, severity and non-negotiable set.
+
+    *non_negotiable* is the precomputed union of the baselines that make a
+    control non-negotiable under *rules*.
+    """
+    cid = rec["control_id"]
+    in_low = cid in low
+    in_moderate = cid in moderate
+    in_high = cid in high
+    in_privacy = cid in privacy
+    rec_out = dict(rec)
+    rec_out["baseline_membership"] = {
+        "low": in_low,
+        "moderate": in_moderate,
+        "high": in_high,
+        "privacy": in_privacy,
+    }
+    rec_out["severity"] = severity_from_flags(in_low, in_moderate, in_high, in_privacy, rules)
+    rec_out["non_negotiable"] = cid in non_negotiable
+    return rec_out
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+
+def _write_json(f: IO[bytes], meta: dict[str, Any], controls: Iterable[dict[str, Any]]) -> None:
+    """Write *meta* plus a ``"controls"`` array drawn lazily from *controls*.
+
+    The bytes are identical to ``orjson.dumps({**meta, "controls": [...]},
+    option=OPT_INDENT_2)``, but only one control is serialized at a time.
+    """
+    head = orjson.dumps(meta, option=orjson.OPT_INDENT_2)
+    f.write(head[: -len(b"\n}")])
+    f.write(b',\n  "controls": [')
+    first = True
+    for rec in controls:
+        f.write(b"\n    " if first else b",\n    ")
+        # JSON strings never contain a raw newline, so this only re-indents.
+        f.write(orjson.dumps(rec, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n    "))
+        first = False
+    f.write(b"]\n}" if first else b"\n  ]\n}")
+
+
+def _tee_jsonl(f: IO[bytes], meta: dict[str, Any], controls: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Write *controls* to *f* as JSON Lines while passing each one through.
+
+    The first line is ``{"$meta": meta}``; every following line is one
+    control.  Wrapping the enrichment generator this way lets the JSON and
+    JSONL files be written in a single pass without collecting the controls.
+    """
+    f.write(orjson.dumps({"$meta": meta}, option=orjson.OPT_APPEND_NEWLINE))
+    for rec in controls:
+        f.write(orjson.dumps(rec, option=orjson.OPT_APPEND_NEWLINE))
+        yield rec
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
 
 
+def _positive_int(value: str) -> int:
+    error = argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    try:
+        n = int(value)
+    except ValueError:
+        raise error from None
+    if n < 1:
+        raise error
+    return n
+
+
 def build_arg_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="ncsb-generate", description="Generate NIST Cloud Security Baseline JSON")
     p.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
@@ -206,17 +523,24 @@ def build_arg_parser() -> argparse.ArgumentParser:
 
     p.add_argument("--non_negotiable_min_baseline", choices=["moderate", "high"], default="moderate")
     p.add_argument("--out", default="nist80053r5_full_catalog_enriched.json")
+    p.add_argument("--jsonl", action="store_true", help="Also write a JSON Lines copy next to --out (.jsonl suffix)")
+    p.add_argument("--no_cache", action="store_true", help="Bypass the local HTTP and parsed-document caches")
+    p.add_argument("--no_stream", action="store_true", help="Load each OSCAL document fully before parsing it")
+    p.add_argument(
+        "--workers", type=_positive_int, default=1, help="Processes for parsing large catalogs (default: 1, no pool)"
+    )
+    p.add_argument("--no_sort", action="store_true", help="Keep catalog order instead of sorting by control ID")
 
     return p
 
 
 def log_orphan_baselines(
-    catalog_ids: set[str],
+    catalog_ids: set[str] | frozenset[str],
     *,
-    low: set[str],
-    moderate: set[str],
-    high: set[str],
-    privacy: set[str],
+    low: set[str] | frozenset[str],
+    moderate: set[str] | frozenset[str],
+    high: set[str] | frozenset[str],
+    privacy: set[str] | frozenset[str],
 ) -> None:
     """Warn about baseline control IDs that don't appear in the catalog."""
     baselines = {"low": low, "moderate": moderate, "high": high, "privacy": privacy}
@@ -231,41 +555,67 @@ def log_orphan_baselines(
             )
 
 
-def main() -> None:
+def main(argv: Sequence[str] | None = None, *, out_stream: IO[bytes] | None = None) -> None:
+    """Run the CLI with *argv* (default: ``sys.argv[1:]``).
+
+    If *out_stream* is given, the JSON document is written to it instead of
+    to ``--out``; ``--jsonl`` is then rejected, so nothing touches the filesystem.
+    """
     logging.basicConfig(format="%(levelname)s: %(message)s", level=logging.WARNING)
-    args = build_arg_parser().parse_args()
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.jsonl and out_stream is not None:
+        raise ValueError("--jsonl writes a sidecar next to --out and cannot be combined with out_stream")
+    if args.jsonl:
+        jsonl_path = Path(args.out).with_suffix(".jsonl")
+        if jsonl_path.resolve() == Path(args.out).resolve():
+            parser.error(f"--jsonl would write the sidecar over --out {args.out}; use a suffix other than .jsonl")
     rules = Rules(non_negotiable_min_baseline=args.non_negotiable_min_baseline)
 
-    catalog_data = download_json(args.catalog_url)
-    low_data = download_json(args.baseline_low_url)
-    mod_data = download_json(args.baseline_moderate_url)
-    high_data = download_json(args.baseline_high_url)
-    priv_data = download_json(args.baseline_privacy_url)
+    with make_session(cache=not args.no_cache) as session:
+        results = _fetch_all(
+            {
+                "catalog": (partial(load_catalog, workers=args.workers), args.catalog_url),
+                "low": (load_profile, args.baseline_low_url),
+                "moderate": (load_profile, args.baseline_moderate_url),
+                "high": (load_profile, args.baseline_high_url),
+                "privacy": (load_profile, args.baseline_privacy_url),
+            },
+            session,
+            stream=not args.no_stream,
+            cache=not args.no_cache,
+        )
 
-    controls = parse_oscal_catalog(catalog_data)
-    low = parse_oscal_profile(low_data)
-    moderate = parse_oscal_profile(mod_data)
-    high = parse_oscal_profile(high_data)
-    privacy = parse_oscal_profile(priv_data)
+    controls = results["catalog"]
+    low = frozenset(results["low"])
+    moderate = frozenset(results["moderate"])
+    high = frozenset(results["high"])
+    privacy = frozenset(results["privacy"])
 
     log_orphan_baselines(
-        set(controls.keys()),
+        frozenset(controls),
         low=low,
         moderate=moderate,
         high=high,
         privacy=privacy,
     )
 
-    enriched = []
-    for cid, rec in sorted(controls.items(), key=lambda x: x[0]):
-        m = membership_flags(cid, low, moderate, high, privacy)
-        rec_out = dict(rec)
-        rec_out["baseline_membership"] = m
-        rec_out["severity"] = severity_from_membership(m, rules)
-        rec_out["non_negotiable"] = non_negotiable_from_membership(m, rules)
-        enriched.append(rec_out)
+    require_high = rules.non_negotiable_min_baseline.lower() == "high"
+    non_negotiable = high if require_high else moderate | high
+    enriched = (
+        _enrich_one(
+            controls[cid],
+            low=low,
+            moderate=moderate,
+            high=high,
+            privacy=privacy,
+            non_negotiable=non_negotiable,
+            rules=rules,
+        )
+        for cid in (controls if args.no_sort else sorted(controls))
+    )
 
-    out_obj = {
+    out_meta = {
         "project": "NIST Cloud Security Baseline (NCSB)",
         "project_version": __version__,
         "generated_at_utc": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
@@ -284,14 +634,19 @@ def main() -> None:
             },
             "non_negotiable_min_baseline": rules.non_negotiable_min_baseline,
         },
-        "count": len(enriched),
-        "controls": enriched,
+        "count": len(controls),
     }
 
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump(out_obj, f, ensure_ascii=False, indent=2)
+    with ExitStack() as stack:
+        f = out_stream if out_stream is not None else stack.enter_context(open(args.out, "wb"))
+        if args.jsonl:
+            enriched = _tee_jsonl(stack.enter_context(open(jsonl_path, "wb")), out_meta, enriched)
+        _write_json(f, out_meta, enriched)
 
-    print(f"Wrote {len(enriched)} controls to {args.out}")
+    if out_stream is None:
+        print(f"Wrote {len(controls)} controls to {args.out}")
+    if args.jsonl:
+        print(f"Wrote {len(controls)} controls to {jsonl_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,35 @@
+"""Shared fixtures: run the generator in memory against the fake OSCAL documents."""
+
+import io
+
+import orjson
+import pytest
+
+from fakes import mock_download
+from ncsb.generate import main
+
+
+def _generate(*argv: str, download=mock_download) -> dict:
+    out = io.BytesIO()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("ncsb.generate.download", download)
+        main(["--no_cache", *argv], out_stream=out)
+    return orjson.loads(out.getvalue())
+
+
+@pytest.fixture
+def run_main():
+    """Callable ``run_main(*argv, download=mock_download)`` returning the parsed output of ``main()``."""
+    return _generate
+
+
+@pytest.fixture(scope="session")
+def default_output() -> dict:
+    """Parsed output of ``main()`` with the default CLI arguments (treat as read-only)."""
+    return _generate()
+
+
+@pytest.fixture(scope="session")
+def high_only_output() -> dict:
+    """Parsed output of ``main()`` with ``--non_negotiable_min_baseline high`` (treat as read-only)."""
+    return _generate("--non_negotiable_min_baseline", "high")
@@ -0,0 +1,178 @@
+"""Fake OSCAL documents and download doubles shared by the test suite."""
+
+import io
+import json
+from contextlib import nullcontext
+from unittest.mock import MagicMock
+
+# ---------------------------------------------------------------------------
+# Fake OSCAL structures
+# ---------------------------------------------------------------------------
+
+FAKE_CATALOG = {
+    "catalog": {
+        "uuid": "test-uuid",
+        "metadata": {
+            "title": "Test",
+            "version": "5.2.0",
+            "oscal-version": "1.1.3",
+            "last-modified": "2025-01-01T00:00:00Z",
+        },
+        "groups": [
+            {
+                "id": "ac",
+                "class": "family",
+                "title": "Access Control",
+                "controls": [
+                    {
+                        "id": "ac-1",
+                        "title": "Policy and Procedures",
+                        "links": [
+                            {"href": "#ac-2", "rel": "related"},
+                        ],
+                        "parts": [
+                            {
+                                "id": "ac-1_smt",
+                                "name": "statement",
+                                "prose": "Develop an access control policy.",
+                            },
+                            {
+                                "id": "ac-1_gdn",
+                                "name": "guidance",
+                                "prose": "None.",
+                            },
+                        ],
+                    },
+                    {
+                        "id": "ac-2",
+                        "title": "Account Management",
+                        "links": [
+                            {"href": "#ac-3", "rel": "related"},
+                            {"href": "#ac-5", "rel": "related"},
+                        ],
+                        "parts": [
+                            {
+                                "id": "ac-2_smt",
+                                "name": "statement",
+                                "prose": "Define and manage system accounts.",
+                            },
+                            {
+                                "id": "ac-2_gdn",
+                                "name": "guidance",
+                                "prose": "None.",
+                            },
+                        ],
+                        "controls": [
+                            {
+                                "id": "ac-2.1",
+                                "title": "Automated System Account Management",
+                                "links": [
+                                    {"href": "#ac-2", "rel": "related"},
+                                ],
+                                "parts": [
+                                    {
+                                        "id": "ac-2.1_smt",
+                                        "name": "statement",
+                                        "prose": "Support management of system accounts using automated mechanisms.",
+                                    },
+                                    {
+                                        "id": "ac-2.1_gdn",
+                                        "name": "guidance",
+                                        "prose": "None.",
+                                    },
+                                ],
+                            },
+                        ],
+                    },
+                ],
+            },
+            {
+                "id": "sc",
+                "class": "family",
+                "title": "System and Communications Protection",
+                "controls": [
+                    {
+                        "id": "sc-7",
+                        "title": "Boundary Protection",
+                        "links": [
+                            {"href": "#ac-4", "rel": "related"},
+                            {"href": "#sc-8", "rel": "related"},
+                        ],
+                        "parts": [
+                            {
+                                "id": "sc-7_smt",
+                                "name": "statement",
+                                "prose": "Monitor and control communications at the boundary.",
+                            },
+                            {
+                                "id": "sc-7_gdn",
+                                "name": "guidance",
+                                "prose": "None.",
+                            },
+                        ],
+                    },
+                ],
+            },
+        ],
+    }
+}
+
+
+def _profile(ids: list[str]) -> dict:
+    return {
+        "profile": {
+            "uuid": "test-uuid",
+            "metadata": {
+                "title": "Test Profile",
+                "version": "5.2.0",
+                "oscal-version": "1.1.3",
+                "last-modified": "2025-01-01T00:00:00Z",
+            },
+            "imports": [
+                {"include-controls": [{"with-ids": ids}]},
+            ],
+        }
+    }
+
+
+FAKE_LOW = _profile(["ac-1", "ac-2"])
+FAKE_MODERATE = _profile(["ac-1", "ac-2", "ac-2.1", "sc-7"])
+FAKE_HIGH = _profile(["ac-1", "ac-2", "ac-2.1", "sc-7"])
+FAKE_PRIVACY = _profile(["ac-1"])
+
+
+def fake_body(doc: dict) -> bytes:
+    """Encode a fake document the way it would arrive over the wire."""
+    return json.dumps(doc).encode()
+
+
+# Checked in order: the first keyword found in the URL wins.
+_FAKE_DOCS = {
+    "catalog": FAKE_CATALOG,
+    "low": FAKE_LOW,
+    "moderate": FAKE_MODERATE,
+    "high": FAKE_HIGH,
+    "privacy": FAKE_PRIVACY,
+}
+# Serialised once at import; every mocked download shares these immutable bodies.
+_FAKE_BODIES = {kind: fake_body(doc) for kind, doc in _FAKE_DOCS.items()}
+
+
+def _fake_kind(url: str) -> str:
+    lower = url.lower()
+    for kind in _FAKE_DOCS:
+        if kind in lower:
+            return kind
+    raise ValueError(f"Unexpected URL in test: {url}")
+
+
+def _response(body: bytes, headers: dict | None = None) -> MagicMock:
+    return MagicMock(content=body, raw=io.BytesIO(body), headers=headers or {}, from_cache=False)
+
+
+def fake_response(doc: dict, headers: dict | None = None) -> MagicMock:
+    return _response(fake_body(doc), headers)
+
+
+def mock_download(url: str, session=None) -> nullcontext:
+    return nullcontext(_response(_FAKE_BODIES[_fake_kind(url)]))
@@ -1,5 +1,5 @@
 import pytest
-from scripts.bump_version import bump_version
+from scripts.bump_version import bump_version, update_version_file
 
 
 def test_bump_version_patch():
@@ -22,3 +22,38 @@ def test_bump_version_invalid_format():
 def test_bump_version_invalid_type():
     with pytest.raises(ValueError, match="Unknown bump type"):
         bump_version("1.0.0", "invalid")
+
+
+PYPROJECT = """[project]
+name = "demo"
+version = "{}"
+description = "x"
+
+[tool.ruff]
+target-version = "py310"
+"""
+
+
+def test_update_version_file_same_length(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(PYPROJECT.format("0.1.3"))
+    assert update_version_file(path, "patch") == ("0.1.3", "0.1.4")
+    assert path.read_text() == PYPROJECT.format("0.1.4")
+
+
+def test_update_version_file_length_changes(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(PYPROJECT.format("0.1.9"))
+    assert update_version_file(path, "patch") == ("0.1.9", "0.1.10")
+    assert path.read_text() == PYPROJECT.format("0.1.10")
+
+    path.write_text(PYPROJECT.format("0.9.10"))
+    assert update_version_file(path, "major") == ("0.9.10", "1.0.0")
+    assert path.read_text() == PYPROJECT.format("1.0.0")
+
+
+def test_update_version_file_missing_version(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text('[project]\nname = "demo"\n')
+    with pytest.raises(ValueError, match="Could not find version string"):
+        update_version_file(path, "patch")
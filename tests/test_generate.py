@@ -1,188 +1,75 @@
 """Tests for ncsb.generate — integration and unit."""
 
-import json
+import codecs
+import io
 import logging
-import tempfile
-from pathlib import Path
+import pickle
+from contextlib import nullcontext
+from itertools import pairwise
 from unittest.mock import MagicMock, patch
 
+import orjson
+import pytest
+import requests
+import requests_cache
+
+from fakes import (
+    FAKE_CATALOG,
+    FAKE_HIGH,
+    FAKE_LOW,
+    FAKE_MODERATE,
+    fake_body,
+    fake_response,
+    mock_download,
+)
 from ncsb.generate import (
     Rules,
+    _body_stream,
     _collect_prose,
+    _fetch_all,
+    _load_oscal,
+    _parse_control_task,
     _related_controls,
-    download_json,
+    _write_json,
+    _write_parsed,
+    build_arg_parser,
+    download,
     family_of,
     log_orphan_baselines,
     main,
+    make_session,
     membership_flags,
     non_negotiable_from_membership,
     parent_of,
     parse_oscal_catalog,
     parse_oscal_profile,
+    severity_from_flags,
     severity_from_membership,
+    stream_oscal_catalog,
+    stream_oscal_profile,
 )
 
-# ---------------------------------------------------------------------------
-# Fake OSCAL structures
-# ---------------------------------------------------------------------------
-
-FAKE_CATALOG = {
-    "catalog": {
-        "uuid": "test-uuid",
-        "metadata": {
-            "title": "Test",
-            "version": "5.2.0",
-            "oscal-version": "1.1.3",
-            "last-modified": "2025-01-01T00:00:00Z",
-        },
-        "groups": [
-            {
-                "id": "ac",
-                "class": "family",
-                "title": "Access Control",
-                "controls": [
-                    {
-                        "id": "ac-1",
-                        "title": "Policy and Procedures",
-                        "links": [
-                            {"href": "#ac-2", "rel": "related"},
-                        ],
-                        "parts": [
-                            {
-                                "id": "ac-1_smt",
-                                "name": "statement",
-                                "prose": "Develop an access control policy.",
-                            },
-                            {
-                                "id": "ac-1_gdn",
-                                "name": "guidance",
-                                "prose": "None.",
-                            },
-                        ],
-                    },
-                    {
-                        "id": "ac-2",
-                        "title": "Account Management",
-                        "links": [
-                            {"href": "#ac-3", "rel": "related"},
-                            {"href": "#ac-5", "rel": "related"},
-                        ],
-                        "parts": [
-                            {
-                                "id": "ac-2_smt",
-                                "name": "statement",
-                                "prose": "Define and manage system accounts.",
-                            },
-                            {
-                                "id": "ac-2_gdn",
-                                "name": "guidance",
-                                "prose": "None.",
-                            },
-                        ],
-                        "controls": [
-                            {
-                                "id": "ac-2.1",
-                                "title": "Automated System Account Management",
-                                "links": [
-                                    {"href": "#ac-2", "rel": "related"},
-                                ],
-                                "parts": [
-                                    {
-                                        "id": "ac-2.1_smt",
-                                        "name": "statement",
-                                        "prose": "Support management of system accounts using automated mechanisms.",
-                                    },
-                                    {
-                                        "id": "ac-2.1_gdn",
-                                        "name": "guidance",
-                                        "prose": "None.",
-                                    },
-                                ],
-                            },
-                        ],
-                    },
-                ],
-            },
-            {
-                "id": "sc",
-                "class": "family",
-                "title": "System and Communications Protection",
-                "controls": [
-                    {
-                        "id": "sc-7",
-                        "title": "Boundary Protection",
-                        "links": [
-                            {"href": "#ac-4", "rel": "related"},
-                            {"href": "#sc-8", "rel": "related"},
-                        ],
-                        "parts": [
-                            {
-                                "id": "sc-7_smt",
-                                "name": "statement",
-                                "prose": "Monitor and control communications at the boundary.",
-                            },
-                            {
-                                "id": "sc-7_gdn",
-                                "name": "guidance",
-                                "prose": "None.",
-                            },
-                        ],
-                    },
-                ],
-            },
-        ],
-    }
-}
-
-
-def _profile(ids: list[str]) -> dict:
-    return {
-        "profile": {
-            "uuid": "test-uuid",
-            "metadata": {
-                "title": "Test Profile",
-                "version": "5.2.0",
-                "oscal-version": "1.1.3",
-                "last-modified": "2025-01-01T00:00:00Z",
-            },
-            "imports": [
-                {"include-controls": [{"with-ids": ids}]},
-            ],
-        }
+_REQUIRED_KEYS = frozenset(
+    {
+        "control_id",
+        "control_name",
+        "family",
+        "control_text",
+        "discussion",
+        "related_controls",
+        "parent_control_id",
+        "baseline_membership",
+        "severity",
+        "non_negotiable",
     }
+)
+_BASELINES = frozenset({"low", "moderate", "high", "privacy"})
+_SEVS = frozenset({"LOW", "MEDIUM", "HIGH", "CRITICAL"})
 
 
-FAKE_LOW = _profile(["ac-1", "ac-2"])
-FAKE_MODERATE = _profile(["ac-1", "ac-2", "ac-2.1", "sc-7"])
-FAKE_HIGH = _profile(["ac-1", "ac-2", "ac-2.1", "sc-7"])
-FAKE_PRIVACY = _profile(["ac-1"])
-
-
-def _mock_download_json(url: str) -> dict:
-    lower = url.lower()
-    if "catalog" in lower:
-        return FAKE_CATALOG
-    if "low" in lower:
-        return FAKE_LOW
-    if "moderate" in lower:
-        return FAKE_MODERATE
-    if "high" in lower:
-        return FAKE_HIGH
-    if "privacy" in lower:
-        return FAKE_PRIVACY
-    raise ValueError(f"Unexpected URL in test: {url}")
-
-
-@patch("ncsb.generate.download_json", side_effect=_mock_download_json)
-def test_main_produces_valid_json(mock_dl):
-    with tempfile.TemporaryDirectory() as tmpdir:
-        out_path = str(Path(tmpdir) / "output.json")
-        with patch("sys.argv", ["ncsb-generate", "--out", out_path]):
-            main()
-
-        with open(out_path, encoding="utf-8") as f:
-            data = json.load(f)
-
+@pytest.mark.integration
+def test_main_produces_valid_json(default_output):
+    data = default_output
     assert data["project"] == "NIST Cloud Security Baseline (NCSB)"
     assert "project_version" in data
     assert "generated_at_utc" in data
@@ -192,41 +79,31 @@ def test_main_produces_valid_json(mock_dl):
     assert isinstance(data["controls"], list)
     assert data["count"] == len(data["controls"])
 
-    ids = [c["control_id"] for c in data["controls"]]
-    assert ids == sorted(ids), "controls should be sorted by control_id"
+    controls = data["controls"]
+    ids = [c["control_id"] for c in controls]
+    assert all(a <= b for a, b in pairwise(ids)), "controls should be sorted by control_id"
 
-    required_keys = {
-        "control_id",
-        "control_name",
-        "family",
-        "control_text",
-        "discussion",
-        "related_controls",
-        "parent_control_id",
-        "baseline_membership",
-        "severity",
-        "non_negotiable",
-    }
-    for ctrl in data["controls"]:
-        assert required_keys.issubset(ctrl.keys())
-        bm = ctrl["baseline_membership"]
-        assert set(bm.keys()) == {"low", "moderate", "high", "privacy"}
-        assert all(isinstance(v, bool) for v in bm.values())
-        assert ctrl["severity"] in {"LOW", "MEDIUM", "HIGH", "CRITICAL"}
-        assert isinstance(ctrl["non_negotiable"], bool)
+    missing = [c["control_id"] for c in controls if not _REQUIRED_KEYS.issubset(c)]
+    assert not missing, f"controls missing required keys: {missing}"
+
+    bad_bm = [
+        c["control_id"]
+        for c in controls
+        if c["baseline_membership"].keys() != _BASELINES
+        or not all(isinstance(v, bool) for v in c["baseline_membership"].values())
+    ]
+    assert not bad_bm, f"malformed baseline_membership: {bad_bm}"
 
+    bad_sev = [c["control_id"] for c in controls if c["severity"] not in _SEVS]
+    assert not bad_sev, f"unexpected severity: {bad_sev}"
 
-@patch("ncsb.generate.download_json", side_effect=_mock_download_json)
-def test_baseline_membership_accuracy(mock_dl):
-    with tempfile.TemporaryDirectory() as tmpdir:
-        out_path = str(Path(tmpdir) / "output.json")
-        with patch("sys.argv", ["ncsb-generate", "--out", out_path]):
-            main()
+    bad_nn = [c["control_id"] for c in controls if not isinstance(c["non_negotiable"], bool)]
+    assert not bad_nn, f"non-bool non_negotiable: {bad_nn}"
 
-        with open(out_path, encoding="utf-8") as f:
-            data = json.load(f)
 
-    by_id = {c["control_id"]: c for c in data["controls"]}
+@pytest.mark.integration
+def test_baseline_membership_accuracy(default_output):
+    by_id = {c["control_id"]: c for c in default_output["controls"]}
 
     ac1 = by_id["AC-1"]
     assert ac1["baseline_membership"] == {"low": True, "moderate": True, "high": True, "privacy": True}
@@ -239,41 +116,99 @@ def test_baseline_membership_accuracy(mock_dl):
     assert sc7["non_negotiable"] is True
 
 
-@patch("ncsb.generate.download_json", side_effect=_mock_download_json)
-def test_enhancement_parent_linkage(mock_dl):
-    with tempfile.TemporaryDirectory() as tmpdir:
-        out_path = str(Path(tmpdir) / "output.json")
-        with patch("sys.argv", ["ncsb-generate", "--out", out_path]):
-            main()
-
-        with open(out_path, encoding="utf-8") as f:
-            data = json.load(f)
-
-    by_id = {c["control_id"]: c for c in data["controls"]}
+@pytest.mark.integration
+def test_enhancement_parent_linkage(default_output):
+    by_id = {c["control_id"]: c for c in default_output["controls"]}
 
     assert by_id["AC-2"]["parent_control_id"] is None
     assert by_id["AC-2(1)"]["parent_control_id"] == "AC-2"
     assert by_id["AC-2(1)"]["family"] == "AC"
 
 
-@patch("ncsb.generate.download_json", side_effect=_mock_download_json)
-def test_non_negotiable_high_only(mock_dl):
+@pytest.mark.integration
+def test_non_negotiable_high_only(high_only_output):
     """When --non_negotiable_min_baseline=high, only high-baseline controls are non-negotiable."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        out_path = str(Path(tmpdir) / "output.json")
-        with patch("sys.argv", ["ncsb-generate", "--out", out_path, "--non_negotiable_min_baseline", "high"]):
-            main()
-
-        with open(out_path, encoding="utf-8") as f:
-            data = json.load(f)
-
-    for ctrl in data["controls"]:
+    for ctrl in high_only_output["controls"]:
         if ctrl["baseline_membership"]["high"]:
             assert ctrl["non_negotiable"] is True
         else:
             assert ctrl["non_negotiable"] is False
 
 
+@pytest.mark.integration
+def test_no_stream_matches_stream(run_main):
+    dl = MagicMock(side_effect=mock_download)
+    outputs = [run_main(*extra, download=dl) for extra in ((), ("--no_stream",))]
+    for data in outputs:
+        del data["generated_at_utc"]
+
+    assert dl.call_count == 10
+    assert outputs[0] == outputs[1]
+
+
+@pytest.mark.integration
+def test_main_writes_out_path(monkeypatch, tmp_path, capsys, default_output):
+    monkeypatch.setattr("ncsb.generate.download", mock_download)
+    out_path = tmp_path / "output.json"
+    main(["--out", str(out_path), "--no_cache"])
+
+    data = orjson.loads(out_path.read_bytes())
+    assert data["controls"] == default_output["controls"]
+    assert capsys.readouterr().out == f"Wrote {data['count']} controls to {out_path}\n"
+
+
+@pytest.mark.integration
+def test_jsonl_sidecar_matches_json(monkeypatch, tmp_path):
+    monkeypatch.setattr("ncsb.generate.download", mock_download)
+    out_path = tmp_path / "output.json"
+    main(["--out", str(out_path), "--no_cache", "--jsonl"])
+
+    data = orjson.loads(out_path.read_bytes())
+    meta, *controls = (orjson.loads(line) for line in (tmp_path / "output.jsonl").read_bytes().splitlines())
+    assert meta == {"$meta": {k: v for k, v in data.items() if k != "controls"}}
+    assert controls == data["controls"]
+
+
+def test_jsonl_rejected_with_out_stream(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError, match="out_stream"):
+        main(["--jsonl"], out_stream=io.BytesIO())
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("value", ["0", "-4", "two"])
+def test_workers_rejects_non_positive(value, capsys):
+    with pytest.raises(SystemExit):
+        main(["--workers", value])
+    assert f"argument --workers: must be a positive integer, got {value!r}" in capsys.readouterr().err
+
+
+def test_workers_accepts_positive():
+    assert build_arg_parser().parse_args(["--workers", "3"]).workers == 3
+
+
+def test_jsonl_rejects_out_with_jsonl_suffix(tmp_path, capsys):
+    out_path = tmp_path / "output.jsonl"
+    with pytest.raises(SystemExit):
+        main(["--out", str(out_path), "--jsonl"])
+
+    assert "--jsonl would write the sidecar over --out" in capsys.readouterr().err
+    assert not out_path.exists()
+
+
+@pytest.mark.integration
+def test_no_sort_keeps_catalog_order(run_main):
+    catalog = {"catalog": {"groups": list(reversed(FAKE_CATALOG["catalog"]["groups"]))}}
+
+    def download_reversed(url, session=None):
+        if "catalog" in url.lower():
+            return nullcontext(fake_response(catalog))
+        return mock_download(url)
+
+    data = run_main("--no_sort", download=download_reversed)
+    assert [c["control_id"] for c in data["controls"]] == ["SC-7", "AC-1", "AC-2", "AC-2(1)"]
+
+
 def test_log_orphan_baselines_warns(caplog):
     catalog_ids = {"AC-1", "AC-2"}
     with caplog.at_level(logging.WARNING):
@@ -310,46 +245,200 @@ def test_log_orphan_baselines_silent_when_no_orphans(caplog):
 # ---------------------------------------------------------------------------
 
 
-def test_download_json():
+def test_download():
     mock_resp = MagicMock()
-    mock_resp.json.return_value = {"catalog": {}}
-    with patch("ncsb.generate.requests.get", return_value=mock_resp) as mock_get:
-        result = download_json("https://example.com/data.json")
-    mock_get.assert_called_once_with("https://example.com/data.json", timeout=120)
+    mock_resp.__enter__.return_value = mock_resp
+    session = MagicMock()
+    session.get.return_value = mock_resp
+    with download("https://example.com/data.json", session) as r:
+        assert r is mock_resp
+    session.get.assert_called_once_with("https://example.com/data.json", stream=True, timeout=120)
     mock_resp.raise_for_status.assert_called_once()
-    assert result == {"catalog": {}}
-
-
-def test_collect_prose_with_sub_parts():
-    """Cover the branch where a matching part has nested sub-parts with prose."""
-    parts = [
-        {
-            "name": "statement",
-            "prose": "Top-level statement.",
-            "parts": [
-                {"prose": "Sub-part A."},
-                {"prose": "Sub-part B."},
-            ],
-        },
-    ]
-    assert _collect_prose(parts, "statement") == "Top-level statement.\nSub-part A.\nSub-part B."
 
 
-def test_collect_prose_nested_under_non_matching_parent():
-    """Cover the elif branch: statement buried inside a wrapper with a different name."""
-    parts = [
-        {
-            "name": "assessment-objective",
-            "parts": [
-                {"name": "statement", "prose": "Nested statement."},
-            ],
-        },
-    ]
-    assert _collect_prose(parts, "statement") == "Nested statement."
+def test_body_stream():
+    mock_resp = MagicMock(from_cache=False, raw=io.BytesIO(b'{"profile": {}}'))
+    assert _body_stream(mock_resp).read() == b'{"profile": {}}'
+    assert mock_resp.raw.decode_content is True
+
+
+def test_body_stream_from_cache():
+    mock_resp = MagicMock(from_cache=True, content=b'{"profile": {}}')
+    assert _body_stream(mock_resp).read() == b'{"profile": {}}'
+
+
+def _load_low(r, *, stream=True, cache=True):
+    parse = MagicMock(side_effect=parse_oscal_profile, __name__="parse_oscal_profile")
+    stream_parse = MagicMock(side_effect=stream_oscal_profile)
+    with patch("ncsb.generate.download", return_value=nullcontext(r)):
+        result = _load_oscal("https://example.com/low.json", None, parse, stream_parse, stream=stream, cache=cache)
+    return result, parse.call_count + stream_parse.call_count
+
 
+@pytest.mark.parametrize("stream", [True, False])
+@pytest.mark.parametrize("from_cache", [False, True])
+def test_load_oscal_accepts_utf8_bom(stream, from_cache):
+    body = codecs.BOM_UTF8 + fake_body(FAKE_LOW)
+    r = MagicMock(content=body, raw=io.BytesIO(body), headers={}, from_cache=from_cache)
+    assert _load_low(r, stream=stream, cache=False) == ({"AC-1", "AC-2"}, 1)
 
-def test_collect_prose_returns_none_when_empty():
-    assert _collect_prose([], "statement") is None
+
+def test_load_oscal_caches_parsed_result_by_etag(tmp_path):
+    with patch("ncsb.generate.CACHE_DIR", tmp_path):
+        assert _load_low(fake_response(FAKE_LOW, {"ETag": '"v1"'})) == ({"AC-1", "AC-2"}, 1)
+        assert _load_low(fake_response(FAKE_LOW, {"ETag": '"v1"'})) == ({"AC-1", "AC-2"}, 0)
+        assert _load_low(fake_response(FAKE_HIGH, {"ETag": '"v2"'}), stream=False)[1] == 1
+        assert _load_low(fake_response(FAKE_HIGH, {"ETag": '"v2"'}))[1] == 0
+        assert _load_low(fake_response(FAKE_LOW, {"ETag": '"v1"'})) == ({"AC-1", "AC-2"}, 1)
+    # A changed ETag replaces the entry for the URL instead of adding a file.
+    assert len(list((tmp_path / "parsed").glob("parse_oscal_profile-*.pkl"))) == 1
+
+
+def test_load_oscal_rereads_after_version_change(tmp_path):
+    with patch("ncsb.generate.CACHE_DIR", tmp_path):
+        _load_low(fake_response(FAKE_LOW, {"ETag": '"v1"'}))
+        with patch("ncsb.generate.__version__", "0.0.0-other"):
+            assert _load_low(fake_response(FAKE_LOW, {"ETag": '"v1"'}))[1] == 1
+
+
+def test_load_oscal_treats_foreign_pickle_as_miss(tmp_path, caplog):
+    with patch("ncsb.generate.CACHE_DIR", tmp_path):
+        _load_low(fake_response(FAKE_LOW, {"ETag": '"v1"'}))
+        (cache_file,) = (tmp_path / "parsed").iterdir()
+        cache_file.write_bytes(pickle.dumps({"AC-1"}))  # e.g. an entry written before stamps were stored
+        with caplog.at_level(logging.WARNING):
+            assert _load_low(fake_response(FAKE_LOW, {"ETag": '"v1"'})) == ({"AC-1", "AC-2"}, 1)
+    assert caplog.text == ""
+
+
+def test_load_oscal_skips_cache_without_etag_or_when_disabled(tmp_path):
+    with patch("ncsb.generate.CACHE_DIR", tmp_path):
+        assert _load_low(fake_response(FAKE_LOW)) == ({"AC-1", "AC-2"}, 1)
+        assert _load_low(fake_response(FAKE_LOW, {"ETag": '"v1"'}), cache=False) == ({"AC-1", "AC-2"}, 1)
+    assert not (tmp_path / "parsed").exists()
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        pytest.param(b"not a pickle", id="unpickling-error"),
+        pytest.param(b"\x80\x05X\x02\x00\x00\x00\xff\xfe.", id="unicode-decode-error"),
+        pytest.param(b"cno_such_module\nthing\n.", id="module-not-found"),
+    ],
+)
+def test_load_oscal_ignores_corrupt_cache(tmp_path, caplog, payload):
+    with patch("ncsb.generate.CACHE_DIR", tmp_path):
+        _load_low(fake_response(FAKE_LOW, {"ETag": '"v1"'}))
+        (cache_file,) = (tmp_path / "parsed").iterdir()
+        cache_file.write_bytes(payload)
+        with caplog.at_level(logging.WARNING):
+            assert _load_low(fake_response(FAKE_LOW, {"ETag": '"v1"'})) == ({"AC-1", "AC-2"}, 1)
+    assert "unreadable parse cache" in caplog.text
+
+
+def test_load_oscal_survives_unwritable_cache(tmp_path, caplog):
+    blocker = tmp_path / "cache"
+    blocker.write_bytes(b"")  # a file where the cache directory should be
+    with patch("ncsb.generate.CACHE_DIR", blocker), caplog.at_level(logging.WARNING):
+        assert _load_low(fake_response(FAKE_LOW, {"ETag": '"v1"'})) == ({"AC-1", "AC-2"}, 1)
+    assert "Could not write parse cache" in caplog.text
+
+
+def test_write_parsed_removes_temp_file_on_failure(tmp_path, caplog):
+    with patch("ncsb.generate.os.replace", side_effect=PermissionError), caplog.at_level(logging.WARNING):
+        _write_parsed(tmp_path / "x.pkl", ("0", '"v1"'), {"a": 1})
+    assert list(tmp_path.iterdir()) == []
+    assert "Could not write parse cache" in caplog.text
+
+
+def test_fetch_all_shares_one_session():
+    load = MagicMock(side_effect=lambda url, session, **kwargs: url)
+    session = requests.Session()
+    results = _fetch_all({"a": (load, "https://example.com/a"), "b": (load, "https://example.com/b")}, session, x=1)
+    assert results == {"a": "https://example.com/a", "b": "https://example.com/b"}
+    assert {c.args[1] for c in load.call_args_list} == {session}
+    assert all(c.kwargs == {"x": 1} for c in load.call_args_list)
+
+
+def test_stream_oscal_catalog_matches_dom():
+    fp = io.BytesIO(fake_body(FAKE_CATALOG))
+    assert stream_oscal_catalog(fp) == parse_oscal_catalog(FAKE_CATALOG)
+
+
+def test_stream_oscal_profile_matches_dom():
+    fp = io.BytesIO(fake_body(FAKE_MODERATE))
+    assert stream_oscal_profile(fp) == parse_oscal_profile(FAKE_MODERATE) == {"AC-1", "AC-2", "AC-2(1)", "SC-7"}
+
+
+def test_make_session_cached(tmp_path):
+    with patch("ncsb.generate.CACHE_DIR", tmp_path):
+        session = make_session()
+    assert isinstance(session, requests_cache.CachedSession)
+    assert session.settings.cache_control is True
+    session.close()
+
+
+def test_make_session_no_cache():
+    session = make_session(cache=False)
+    assert type(session) is requests.Session
+
+
+def test_make_session_pools_and_retries():
+    session = make_session(cache=False)
+    adapter = session.get_adapter("https://raw.githubusercontent.com/")
+    assert adapter._pool_maxsize == 8
+    assert adapter.max_retries.total == 3
+    assert 503 in adapter.max_retries.status_forcelist
+
+
+def test_write_json_matches_orjson():
+    meta = {"project": "NCSB", "count": 2}
+    controls = [{"control_id": "AC-1", "text": "Line one\nline two"}, {"control_id": "AC-2", "nested": {"a": [1]}}]
+    for items in (controls, []):
+        buf = io.BytesIO()
+        _write_json(buf, meta, iter(items))
+        assert buf.getvalue() == orjson.dumps({**meta, "controls": items}, option=orjson.OPT_INDENT_2)
+
+
+@pytest.mark.parametrize(
+    "parts, targets, expected",
+    [
+        pytest.param(
+            [
+                {
+                    "name": "statement",
+                    "prose": "Top-level statement.",
+                    "parts": [{"prose": "Sub-part A."}, {"prose": "Sub-part B."}],
+                },
+            ],
+            ("statement",),
+            {"statement": ["Top-level statement.", "Sub-part A.", "Sub-part B."]},
+            id="matching-part-with-sub-parts",
+        ),
+        pytest.param(
+            [{"name": "assessment-objective", "parts": [{"name": "statement", "prose": "Nested statement."}]}],
+            ("statement",),
+            {"statement": ["Nested statement."]},
+            id="nested-under-non-matching-parent",
+        ),
+        pytest.param(
+            # A part matched for one target is still searched for the others.
+            [
+                {"name": "statement", "prose": "S1.", "parts": [{"name": "guidance", "prose": "G-inner."}]},
+                {
+                    "name": "wrapper",
+                    "parts": [{"name": "statement", "prose": "S2."}, {"name": "guidance", "prose": "G2."}],
+                },
+            ],
+            ("statement", "guidance"),
+            {"statement": ["S1.", "G-inner.", "S2."], "guidance": ["G-inner.", "G2."]},
+            id="multiple-targets-in-document-order",
+        ),
+        pytest.param([], ("statement", "guidance"), {"statement": [], "guidance": []}, id="nothing-matches"),
+    ],
+)
+def test_collect_prose(parts, targets, expected):
+    assert _collect_prose(parts, targets) == expected
 
 
 def test_related_controls_ignores_non_related_links():
@@ -365,38 +454,32 @@ def test_related_controls_returns_none_when_empty():
     assert _related_controls([]) is None
 
 
-def test_severity_high_only():
-    rules = Rules()
-    m = {"low": False, "moderate": False, "high": True, "privacy": False}
-    assert severity_from_membership(m, rules) == "CRITICAL"
-
-
-def test_severity_privacy_only():
-    rules = Rules()
-    m = {"low": False, "moderate": False, "high": False, "privacy": True}
-    assert severity_from_membership(m, rules) == "MEDIUM"
+@pytest.mark.parametrize(
+    "membership, expected",
+    [
+        pytest.param({"low": False, "moderate": False, "high": True, "privacy": False}, "CRITICAL", id="high-only"),
+        pytest.param({"low": False, "moderate": False, "high": False, "privacy": True}, "MEDIUM", id="privacy-only"),
+        pytest.param({"low": False, "moderate": False, "high": False, "privacy": False}, "LOW", id="no-baseline"),
+    ],
+)
+def test_severity_from_membership(membership, expected):
+    assert severity_from_membership(membership, Rules()) == expected
 
 
-def test_severity_no_baseline():
+def test_severity_from_flags_prefers_lowest_baseline():
     rules = Rules()
-    m = {"low": False, "moderate": False, "high": False, "privacy": False}
-    assert severity_from_membership(m, rules) == "LOW"
+    assert severity_from_flags(True, True, True, True, rules) == "MEDIUM"
+    assert severity_from_flags(False, True, True, False, rules) == "HIGH"
 
 
-def test_parent_of_base_control():
-    assert parent_of("AC-2") is None
+@pytest.mark.parametrize("control_id, expected", [("AC-2", None), ("AC-2(1)", "AC-2")])
+def test_parent_of(control_id, expected):
+    assert parent_of(control_id) == expected
 
 
-def test_parent_of_enhancement():
-    assert parent_of("AC-2(1)") == "AC-2"
-
-
-def test_family_of_base():
-    assert family_of("SC-7") == "SC"
-
-
-def test_family_of_enhancement():
-    assert family_of("AC-2(1)") == "AC"
+@pytest.mark.parametrize("control_id, expected", [("SC-7", "SC"), ("AC-2(1)", "AC")])
+def test_family_of(control_id, expected):
+    assert family_of(control_id) == expected
 
 
 def test_membership_flags():
@@ -410,6 +493,30 @@ def test_non_negotiable_moderate_default():
     assert non_negotiable_from_membership({"moderate": False, "high": False}, rules) is False
 
 
+def test_non_negotiable_high_rule():
+    rules = Rules(non_negotiable_min_baseline="high")
+    assert non_negotiable_from_membership({"moderate": True, "high": True}, rules) is True
+    assert non_negotiable_from_membership({"moderate": True, "high": False}, rules) is False
+
+
+def test_parse_oscal_catalog_with_workers_matches_serial():
+    serial = parse_oscal_catalog(FAKE_CATALOG)
+    with patch("ncsb.generate.PARALLEL_MIN_CONTROLS", 0):
+        parallel = parse_oscal_catalog(FAKE_CATALOG, workers=2)
+    assert list(parallel.items()) == list(serial.items())
+
+
+def test_parse_oscal_catalog_workers_below_threshold_stays_serial():
+    with patch("ncsb.generate.multiprocessing.get_context") as get_context:
+        assert parse_oscal_catalog(FAKE_CATALOG, workers=4) == parse_oscal_catalog(FAKE_CATALOG)
+    get_context.assert_not_called()
+
+
+def test_parse_control_task():
+    ctrl = FAKE_CATALOG["catalog"]["groups"][0]["controls"][1]["controls"][0]
+    assert _parse_control_task((ctrl, "AC-2"))["parent_control_id"] == "AC-2"
+
+
 def test_parse_oscal_catalog_empty():
     assert parse_oscal_catalog({}) == {}
     assert parse_oscal_catalog({"catalog": {}}) == {}
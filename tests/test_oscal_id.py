@@ -1,22 +1,25 @@
-from ncsb.generate import oscal_id_to_control_id
-
-
-def test_base_control():
-    assert oscal_id_to_control_id("ac-2") == "AC-2"
-
-
-def test_enhancement():
-    assert oscal_id_to_control_id("ac-2.1") == "AC-2(1)"
+import pytest
 
-
-def test_enhancement_double_digit():
-    assert oscal_id_to_control_id("ia-2.12") == "IA-2(12)"
-
-
-def test_zero_padded_enhancement():
-    assert oscal_id_to_control_id("ac-2.01") == "AC-2(1)"
+from ncsb.generate import oscal_id_to_control_id
 
 
-def test_three_letter_family():
-    assert oscal_id_to_control_id("pii-3") == "PII-3"
-    assert oscal_id_to_control_id("pii-3.2") == "PII-3(2)"
+@pytest.mark.parametrize(
+    "oscal_id, expected",
+    [
+        pytest.param("ac-2", "AC-2", id="base-control"),
+        pytest.param("ac-2.1", "AC-2(1)", id="enhancement"),
+        pytest.param("ia-2.12", "IA-2(12)", id="enhancement-double-digit"),
+        pytest.param("ac-2.01", "AC-2(1)", id="zero-padded-enhancement"),
+        pytest.param("pii-3", "PII-3", id="three-letter-family"),
+        pytest.param("pii-3.2", "PII-3(2)", id="three-letter-family-enhancement"),
+    ],
+)
+def test_oscal_id_to_control_id(oscal_id, expected):
+    assert oscal_id_to_control_id(oscal_id) == expected
+
+
+@pytest.mark.parametrize("oscal_id", ["ac-2.1.3", "ia-2.12.1"])
+def test_oscal_id_to_control_id_rejects_nested_enhancement(oscal_id):
+    """A malformed multi-dot ID raises instead of being truncated to its base control."""
+    with pytest.raises(ValueError):
+        oscal_id_to_control_id(oscal_id)